@@ -0,0 +1,210 @@
+import argparse
+import asyncio
+import contextlib
+
+from cli import MAX_CONCURRENT_REQUESTS
+from jsonl_sink import JsonlSink
+from openai_batch import run_batch_job
+from openai_client import add_model_arguments, close_client, get_client, resolve_model
+
+async def run_task(thinker_name, generate, store, client, model, semaphore, label):
+    """
+    Generate and store one thinker's output, reporting (rather than raising) any failure.
+
+    Args:
+        thinker_name (str): Name of the thinker
+        generate (Callable): Coroutine function taking (thinker_name, client, model); returns the result, or None on failure
+        store (Callable): Writes a result to the chosen destination, called as store(thinker_name, result)
+        client (openai.AsyncOpenAI): OpenAI client shared across the batch
+        model (str): OpenAI model to use
+        semaphore (asyncio.Semaphore): Bounds the number of concurrent requests
+        label (str): What is being generated, e.g. "essay"
+
+    Returns:
+        The value returned by store if successful, None otherwise
+    """
+    try:
+        async with semaphore:
+            print(f"📝 Generating {label} for: {thinker_name}")
+            result = await generate(thinker_name, client, model)
+
+        if not result:
+            print(f"❌ Failed to generate {label} for {thinker_name}")
+            return None
+
+        stored = await asyncio.to_thread(store, thinker_name, result)
+        print(f"✅ Successfully generated {label} for {thinker_name}")
+        return stored
+
+    except Exception as e:
+        print(f"❌ Error processing {thinker_name}: {e}")
+        return None
+
+async def run_batch(thinkers, generate, store, client, model, label, concurrency=MAX_CONCURRENT_REQUESTS):
+    """
+    Generate and store the output for all thinkers concurrently.
+
+    Args:
+        thinkers (list): Names of the thinkers to process
+        generate (Callable): Coroutine function taking (thinker_name, client, model); returns the result, or None on failure
+        store (Callable): Writes a result to the chosen destination, called as store(thinker_name, result)
+        client (openai.AsyncOpenAI): OpenAI client shared across the batch, closed when the batch finishes
+        model (str): OpenAI model to use
+        label (str): What is being generated, e.g. "essay"
+        concurrency (int): Maximum number of requests in flight
+
+    Returns:
+        list: Per thinker, the value returned by store, or None if that thinker failed
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [run_task(thinker, generate, store, client, model, semaphore, label) for thinker in thinkers]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        await close_client(client)
+
+async def run_batch_api(thinkers, build_request, parse_output, store, client, model, label, poll_interval, batch_id=None):
+    """
+    Generate the output for all thinkers with a single OpenAI Batch API job, then store it.
+
+    Args:
+        thinkers (list): Names of the thinkers to process
+        build_request (Callable): Returns the chat completion arguments, called as build_request(thinker_name, model)
+        parse_output (Callable): Turns a returned text into the result passed to store (None keeps the text as is)
+        store (Callable): Writes a result to the chosen destination, called as store(thinker_name, result)
+        client (openai.AsyncOpenAI): OpenAI client, closed when the batch finishes
+        model (str): OpenAI model to use
+        label (str): What is being generated, e.g. "essay"
+        poll_interval (float): Seconds to wait between batch status checks
+        batch_id (str): Already submitted batch to collect instead of submitting a new one (optional)
+
+    Returns:
+        list: Per thinker, the value returned by store, or None if that thinker failed
+    """
+    try:
+        if batch_id is None:
+            bodies = await asyncio.gather(*(asyncio.to_thread(build_request, thinker, model) for thinker in thinkers))
+            requests = dict(zip(thinkers, bodies))
+        else:
+            requests = {}
+        outputs = await run_batch_job(client, requests, poll_interval, batch_id)
+    finally:
+        await close_client(client)
+
+    results = []
+    for thinker in thinkers:
+        output = outputs.get(thinker)
+        if not output:
+            print(f"❌ Failed to generate {label} for {thinker}")
+            results.append(None)
+            continue
+        try:
+            result = parse_output(output) if parse_output else output
+            stored = await asyncio.to_thread(store, thinker, result)
+        except Exception as e:
+            print(f"❌ Error processing {thinker}: {e}")
+            results.append(None)
+            continue
+        print(f"✅ Successfully generated {label} for {thinker}")
+        results.append(stored)
+    return results
+
+def make_store(sink, save, render):
+    """
+    Pick where generated results go: the JSONL sink if one is open, per-thinker files otherwise.
+
+    Args:
+        sink (JsonlSink): Open sink, or None to write files
+        save (Callable): Writes a result to its own file as save(thinker_name, result), returning the path
+        render (Callable): Turns a result into JSONL record fields
+
+    Returns:
+        Callable: store(thinker_name, result), returning the saved path, or True for a sink record
+    """
+    if sink is None:
+        return save
+
+    def store(thinker_name, result):
+        sink.write(thinker_name, render(result))
+        return True
+
+    return store
+
+def batch_main(thinkers, generate, build_request, save, render, *, parse_output=None, label, description, title,
+               jsonl_path, structured_output=False):
+    """
+    Command-line entry point shared by the batch generation scripts.
+
+    Parses the command line, asks for the API key, runs the batch either
+    concurrently or through the Batch API, stores each result in a file or
+    the JSONL sink, and prints a summary.
+
+    Args:
+        thinkers (list): Names of the thinkers to process
+        generate (Callable): Coroutine function taking (thinker_name, client, model); returns the result, or None on failure
+        build_request (Callable): Returns the chat completion arguments as build_request(thinker_name, model) (Batch API mode)
+        save (Callable): Writes a result to its own file as save(thinker_name, result), returning the path
+        render (Callable): Turns a result into JSONL record fields (--output jsonl)
+        parse_output (Callable): Turns a Batch API output text into a result (optional, defaults to the text itself)
+        label (str): What is being generated, e.g. "essay"
+        description (str): Description shown in --help
+        title (str): Heading of the final summary
+        jsonl_path (Path): Sink used instead of per-thinker files with --output jsonl
+        structured_output (bool): The requests use a json_schema response format, which not every model supports
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--batch-api', action='store_true', help='Submit all requests as one OpenAI Batch API job (cheaper, completes within 24h)')
+    parser.add_argument('--resume-batch', metavar='BATCH_ID', help='Collect the results of an already submitted Batch API job instead of submitting a new one')
+    parser.add_argument('--poll-interval', type=float, default=30, help='Seconds between Batch API status checks (default: 30)')
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENT_REQUESTS, help=f'Maximum number of requests in flight (default: {MAX_CONCURRENT_REQUESTS})')
+    parser.add_argument('--output', choices=['txt', 'jsonl'], default='txt', help=f'Write one file per thinker (txt) or append to {jsonl_path.name} (jsonl) (default: txt)')
+    add_model_arguments(parser, structured_output)
+
+    args = parser.parse_args()
+    model = resolve_model(args.model, args.quality, structured_output)
+
+    # Get API key from environment or user input
+    api_key = input("Enter your OpenAI API key (or press Enter if set as environment variable): ").strip()
+    if not api_key:
+        api_key = None
+
+    try:
+        client = get_client(api_key)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return
+
+    print(f"\n🚀 Starting batch {label} generation for {len(thinkers)} thinkers...")
+    print(f"Thinkers to process: {', '.join(thinkers)}")
+    print(f"Model: {model}")
+
+    try:
+        with JsonlSink(jsonl_path) if args.output == 'jsonl' else contextlib.nullcontext() as sink:
+            store = make_store(sink, save, render)
+            if args.batch_api or args.resume_batch:
+                results = asyncio.run(run_batch_api(thinkers, build_request, parse_output, store, client, model, label, args.poll_interval, args.resume_batch))
+            else:
+                results = asyncio.run(run_batch(thinkers, generate, store, client, model, label, args.concurrency))
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return
+
+    successful = sum(1 for result in results if result)
+    failed = len(results) - successful
+
+    # Summary
+    print(f"\n{'='*60}")
+    print(f"🎉 {title}")
+    print(f"{'='*60}")
+    print(f"✅ Successful: {successful}")
+    print(f"❌ Failed: {failed}")
+    print(f"📊 Total processed: {len(thinkers)}")
+
+    if successful > 0 and args.output == 'jsonl':
+        print(f"\n📁 Generated {label}s appended to: {jsonl_path}")
+    elif successful > 0:
+        saved = [path for path in results if path]
+        print(f"\n📁 Generated {label}s saved in: {saved[0].parent}/")
+        print("Files created:")
+        for path in saved:
+            print(f"  - {path.name}")
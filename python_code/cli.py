@@ -0,0 +1,38 @@
+import asyncio
+import sys
+
+from openai_client import close_client
+
+# Maximum number of requests in flight at once
+MAX_CONCURRENT_REQUESTS = 8
+
+def read_thinker_names(thinker_names):
+    """
+    Expand a lone "-" argument into thinker names read from stdin, one per line.
+
+    Args:
+        thinker_names (list): Names given on the command line
+
+    Returns:
+        list: Names of the thinkers to process
+    """
+    if thinker_names == ['-']:
+        return [line.strip() for line in sys.stdin if line.strip()]
+    return thinker_names
+
+async def process_each(thinker_names, process_thinker, client, model, concurrency=MAX_CONCURRENT_REQUESTS):
+    """
+    Run a single-thinker script's work for several thinkers concurrently.
+
+    Args:
+        thinker_names (list): Names of the thinkers to process
+        process_thinker (Callable): Coroutine function taking (thinker_name, client, model, semaphore)
+        client (openai.AsyncOpenAI): OpenAI client shared across thinkers, closed when all are done
+        model (str): OpenAI model to use
+        concurrency (int): Maximum number of requests in flight
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    try:
+        await asyncio.gather(*(process_thinker(name, client, model, semaphore) for name in thinker_names))
+    finally:
+        await close_client(client)
@@ -0,0 +1,41 @@
+import argparse
+
+from generate_thinker_meaning import save_thinker_essay
+from generate_thinker_questionnaires import Questionnaire, save_questionnaire
+from jsonl_sink import read_latest_records
+from thinkers import ESSAYS_JSONL, QUESTIONNAIRES_JSONL
+
+def dump_one(thinker_name, questionnaire=False):
+    """
+    Write a thinker's latest JSONL record out as the usual per-thinker text file.
+
+    Args:
+        thinker_name (str): Name of the thinker
+        questionnaire (bool): Dump the questionnaire instead of the essay
+
+    Returns:
+        Path: Path of the written file, or None if the thinker has no record
+    """
+    if questionnaire:
+        record = read_latest_records(QUESTIONNAIRES_JSONL).get(thinker_name)
+        if record:
+            return save_questionnaire(thinker_name, Questionnaire.model_validate(record["questionnaire"]))
+    else:
+        record = read_latest_records(ESSAYS_JSONL).get(thinker_name)
+        if record:
+            return save_thinker_essay(thinker_name, record["text"])
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Write thinkers\' records from the JSONL sinks out as individual text files')
+    parser.add_argument('thinker_names', nargs='+', help='Names of the thinkers/philosophers')
+    parser.add_argument('--questionnaire', action='store_true', help='Dump questionnaires.jsonl records instead of essays.jsonl')
+
+    args = parser.parse_args()
+
+    for thinker_name in args.thinker_names:
+        if not dump_one(thinker_name, args.questionnaire):
+            print(f"❌ No record found for {thinker_name}")
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,16 @@
-import os
-import openai
-from pathlib import Path
+import asyncio
 import argparse
 from datetime import datetime
 
-def setup_openai_client(api_key=None):
-    """Setup OpenAI client with API key."""
-    if api_key:
-        client = openai.OpenAI(api_key=api_key)
-    else:
-        # Try to get from environment variable
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY environment variable or pass it as argument.")
-        client = openai.OpenAI(api_key=api_key)
-    return client
+from cli import MAX_CONCURRENT_REQUESTS, process_each, read_thinker_names
+from prompts import Prompt
+from openai_client import DEFAULT_MODEL, add_model_arguments, get_client, resolve_model
+from rate_limiting import create_chat_completion, stream_chat_completion
+from thinkers import THINKERS_DIR, essay_path
 
-def generate_thinker_meaning_essay(thinker_name, api_key=None, model="gpt-4"):
-    """
-    Generate a 1-page essay about a thinker's ideas on meaning.
-    
-    Args:
-        thinker_name (str): Name of the thinker/philosopher
-        api_key (str): OpenAI API key (optional, can use environment variable)
-        model (str): OpenAI model to use
-    
-    Returns:
-        str: Generated essay text
-    """
-    client = setup_openai_client(api_key)
-    
-    prompt = f"""
+ESSAY_PROMPT = Prompt(
+    system="You are a knowledgeable philosophy researcher specializing in the study of meaning and purpose in human existence.",
+    user_template="""
     Write a comprehensive 1-page essay (approximately 500-600 words) about {thinker_name}'s ideas and philosophy regarding the meaning of life and human existence.
     
     The essay should include:
@@ -42,18 +22,41 @@ def generate_thinker_meaning_essay(thinker_name, api_key=None, model="gpt-4"):
     
     Write in an academic but accessible style, suitable for research purposes. 
     Focus on their most important contributions to the philosophy of meaning.
+    """,
+    max_tokens=1000
+)
+
+def build_essay_request(thinker_name, model=DEFAULT_MODEL):
+    """
+    Build the chat completion arguments for a thinker's meaning essay.
+    
+    Args:
+        thinker_name (str): Name of the thinker/philosopher
+        model (str): OpenAI model to use
+    
+    Returns:
+        dict: Keyword arguments for client.chat.completions.create
+    """
+    return ESSAY_PROMPT.request(model, thinker_name=thinker_name)
+
+async def generate_thinker_meaning_essay(thinker_name, api_key=None, model=DEFAULT_MODEL, client=None):
     """
+    Generate a 1-page essay about a thinker's ideas on meaning.
+    
+    Args:
+        thinker_name (str): Name of the thinker/philosopher
+        api_key (str): OpenAI API key (optional, can use environment variable)
+        model (str): OpenAI model to use
+        client (openai.AsyncOpenAI): Existing client to reuse (optional)
+    
+    Returns:
+        str: Generated essay text
+    """
+    if client is None:
+        client = get_client(api_key)
     
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a knowledgeable philosophy researcher specializing in the study of meaning and purpose in human existence."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
+        response = await create_chat_completion(client, **build_essay_request(thinker_name, model))
         
         return response.choices[0].message.content.strip()
     
@@ -61,6 +64,44 @@ def generate_thinker_meaning_essay(thinker_name, api_key=None, model="gpt-4"):
         print(f"Error generating essay: {e}")
         return None
 
+async def stream_thinker_meaning_essay(thinker_name, api_key=None, model=DEFAULT_MODEL, client=None):
+    """
+    Stream a 1-page essay about a thinker's ideas on meaning as it is generated.
+    
+    Args:
+        thinker_name (str): Name of the thinker/philosopher
+        api_key (str): OpenAI API key (optional, can use environment variable)
+        model (str): OpenAI model to use
+        client (openai.AsyncOpenAI): Existing client to reuse (optional)
+    
+    Yields:
+        str: Successive pieces of the essay text
+    """
+    if client is None:
+        client = get_client(api_key)
+    
+    async for chunk in stream_chat_completion(client, **build_essay_request(thinker_name, model)):
+        yield chunk
+
+def get_essay_path(thinker_name):
+    """
+    Return the path of a thinker's essay, creating the thinkers_texts directory if needed.
+    
+    Args:
+        thinker_name (str): Name of the thinker
+    
+    Returns:
+        Path: Path of the essay file
+    """
+    # Create thinkers_texts directory if it doesn't exist
+    THINKERS_DIR.mkdir(exist_ok=True)
+    return essay_path(thinker_name)
+
+def essay_header(thinker_name):
+    """Return the metadata header written at the top of every essay file."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return f"Generated on: {timestamp}\nThinker: {thinker_name}\n{'='*50}\n\n"
+
 def save_thinker_essay(thinker_name, essay_text):
     """
     Save the generated essay to a file in the thinkers_texts directory.
@@ -69,46 +110,101 @@ def save_thinker_essay(thinker_name, essay_text):
         thinker_name (str): Name of the thinker
         essay_text (str): The generated essay text
     """
-    # Create thinkers_texts directory if it doesn't exist
-    thinkers_dir = Path("../thinkers_texts")
-    thinkers_dir.mkdir(exist_ok=True)
-    
-    # Create filename
-    filename = f"{thinker_name.replace(' ', '_').lower()}_meaning.txt"
-    filepath = thinkers_dir / filename
-    
-    # Add metadata header
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    header = f"Generated on: {timestamp}\nThinker: {thinker_name}\n{'='*50}\n\n"
+    filepath = get_essay_path(thinker_name)
     
     # Write to file
     with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(header)
+        f.write(essay_header(thinker_name))
         f.write(essay_text)
     
     print(f"Essay saved to: {filepath}")
     return filepath
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate thinker meaning essays using GPT')
-    parser.add_argument('thinker_name', help='Name of the thinker/philosopher')
-    parser.add_argument('--api-key', help='OpenAI API key (optional if set as environment variable)')
-    parser.add_argument('--model', default='gpt-4', help='OpenAI model to use (default: gpt-4)')
+async def write_thinker_essay(thinker_name, essay_chunks):
+    """
+    Write an essay to the thinkers_texts directory while it is still being generated.
     
-    args = parser.parse_args()
+    Chunks are written to a ".part" file as they arrive, which replaces the
+    essay file only once the stream completes, so a failed request never
+    leaves a truncated essay behind.
     
-    print(f"Generating essay about {args.thinker_name}'s ideas on meaning...")
+    Args:
+        thinker_name (str): Name of the thinker
+        essay_chunks (AsyncIterator[str]): Pieces of the essay text
     
-    # Generate the essay
-    essay = generate_thinker_meaning_essay(args.thinker_name, args.api_key, args.model)
+    Returns:
+        Path: Path of the saved essay, or None if the response was empty
+    """
+    # Opening, flushing and renaming touch the disk, so they run in a worker
+    # thread rather than blocking the event loop other requests are running on
+    filepath = await asyncio.to_thread(get_essay_path, thinker_name)
+    partial_path = filepath.with_name(filepath.name + ".part")
+    
+    try:
+        written = 0
+        f = await asyncio.to_thread(open, partial_path, 'w', encoding='utf-8')
+        try:
+            f.write(essay_header(thinker_name))
+            async for chunk in essay_chunks:
+                f.write(chunk)
+                written += len(chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+        if not written:
+            await asyncio.to_thread(partial_path.unlink)
+            return None
+        await asyncio.to_thread(partial_path.replace, filepath)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
     
-    if essay:
-        # Save to file
-        filepath = save_thinker_essay(args.thinker_name, essay)
+    print(f"Essay saved to: {filepath}")
+    return filepath
+
+async def process_thinker(thinker_name, client, model, semaphore):
+    """
+    Generate and save the essay for one thinker.
+    
+    Args:
+        thinker_name (str): Name of the thinker/philosopher
+        client (openai.AsyncOpenAI): OpenAI client shared across thinkers
+        model (str): OpenAI model to use
+        semaphore (asyncio.Semaphore): Bounds the number of concurrent requests
+    """
+    try:
+        async with semaphore:
+            print(f"Generating essay about {thinker_name}'s ideas on meaning...")
+            filepath = await write_thinker_essay(
+                thinker_name,
+                stream_thinker_meaning_essay(thinker_name, model=model, client=client)
+            )
+    except Exception as e:
+        print(f"Error generating essay: {e}")
+        filepath = None
+    
+    if filepath:
         print(f"\nEssay generated successfully!")
         print(f"File saved: {filepath}")
     else:
-        print("Failed to generate essay.")
+        print(f"Failed to generate essay for {thinker_name}.")
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate thinker meaning essays using GPT')
+    parser.add_argument('thinker_names', nargs='+', help='Names of the thinkers/philosophers ("-" reads one name per line from stdin)')
+    parser.add_argument('--api-key', help='OpenAI API key (optional if set as environment variable)')
+    add_model_arguments(parser)
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENT_REQUESTS, help=f'Maximum number of requests in flight (default: {MAX_CONCURRENT_REQUESTS})')
+    
+    args = parser.parse_args()
+    
+    try:
+        client = get_client(args.api_key)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    
+    model = resolve_model(args.model, args.quality)
+    asyncio.run(process_each(read_thinker_names(args.thinker_names), process_thinker, client, model, args.concurrency))
 
 if __name__ == "__main__":
     main()
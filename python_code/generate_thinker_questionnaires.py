@@ -1,234 +1,311 @@
+import asyncio
+import functools
 import os
-import openai
-from pathlib import Path
 import argparse
 from datetime import datetime
 import json
 
-def setup_openai_client(api_key=None):
-    """Setup OpenAI client with API key."""
-    if api_key:
-        client = openai.OpenAI(api_key=api_key)
-    else:
-        # Try to get from environment variable
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY environment variable or pass it as argument.")
-        client = openai.OpenAI(api_key=api_key)
-    return client
-
-def get_standard_questionnaire_examples():
-    """
-    Return example questionnaire structures to use as templates.
-    These are common meaning questionnaire formats.
-    """
-    examples = {
-        "MLQ": {
-            "name": "Meaning in Life Questionnaire (MLQ)",
-            "structure": """
-            The Meaning in Life Questionnaire typically includes:
-            
-            1. PRESENCE OF MEANING (5 items) - measuring how much respondents feel their lives have meaning
-            Example items:
-            - I understand my life's meaning
-            - My life has a clear sense of purpose
-            - I have a good sense of what makes my life meaningful
-            
-            2. SEARCH FOR MEANING (5 items) - measuring how much respondents are actively seeking meaning
-            Example items:
-            - I am looking for something that makes my life feel meaningful
-            - I am seeking a purpose or mission for my life
-            - I am always looking to find my life's purpose
-            
-            Response scale: 1 (Absolutely untrue) to 7 (Absolutely true)
-            """,
-        },
-        "PIL": {
-            "name": "Purpose in Life Test (PIL)",
-            "structure": """
-            The Purpose in Life Test typically includes:
-            
-            Multiple dimensions of meaning:
-            1. LIFE SATISFACTION AND EXCITEMENT
-            2. GOAL-DIRECTEDNESS
-            3. DEATH ACCEPTANCE
-            4. FREEDOM
-            5. SELF-REALIZATION
-            6. MEANINGFULNESS
-            
-            Example items:
-            - I am usually: (a) bored (b) neutral (c) excited about life
-            - My life is: (a) empty and without purpose (b) routine (c) full of good things
-            - I am: (a) undecided about my life goals (b) somewhat clear (c) very clear about my life goals
-            
-            Response format: 7-point bipolar scales
-            """,
-        },
-        "MAPS": {
-            "name": "Multidimensional Assessment of Purpose in Life (MAPS)",
-            "structure": """
-            The MAPS typically includes:
-            
-            Multiple dimensions:
-            1. PURPOSE AWARENESS
-            2. PURPOSE ENGAGEMENT
-            3. PURPOSE ALIGNMENT
-            4. PURPOSE MEANINGFULNESS
-            
-            Example items:
-            - I have a clear sense of my purpose in life
-            - I actively work toward my life purpose
-            - My daily activities align with my life purpose
-            - My purpose gives my life meaning and direction
-            
-            Response scale: 1 (Strongly disagree) to 7 (Strongly agree)
-            """
-        }
+from pydantic import BaseModel, ConfigDict
+
+from cli import MAX_CONCURRENT_REQUESTS, process_each, read_thinker_names
+from jsonl_sink import read_latest_records
+from prompts import Prompt
+from openai_client import DEFAULT_MODEL, add_model_arguments, get_client, resolve_model
+from rate_limiting import create_chat_completion
+from thinkers import ESSAYS_JSONL, QUESTIONNAIRES_DIR, essay_path, questionnaire_path
+
+# Common meaning questionnaire formats used as structural templates
+STANDARD_QUESTIONNAIRE_EXAMPLES = {
+    "MLQ": {
+        "name": "Meaning in Life Questionnaire (MLQ)",
+        "structure": """
+        The Meaning in Life Questionnaire typically includes:
+        
+        1. PRESENCE OF MEANING (5 items) - measuring how much respondents feel their lives have meaning
+        Example items:
+        - I understand my life's meaning
+        - My life has a clear sense of purpose
+        - I have a good sense of what makes my life meaningful
+        
+        2. SEARCH FOR MEANING (5 items) - measuring how much respondents are actively seeking meaning
+        Example items:
+        - I am looking for something that makes my life feel meaningful
+        - I am seeking a purpose or mission for my life
+        - I am always looking to find my life's purpose
+        
+        Response scale: 1 (Absolutely untrue) to 7 (Absolutely true)
+        """,
+    },
+    "PIL": {
+        "name": "Purpose in Life Test (PIL)",
+        "structure": """
+        The Purpose in Life Test typically includes:
+        
+        Multiple dimensions of meaning:
+        1. LIFE SATISFACTION AND EXCITEMENT
+        2. GOAL-DIRECTEDNESS
+        3. DEATH ACCEPTANCE
+        4. FREEDOM
+        5. SELF-REALIZATION
+        6. MEANINGFULNESS
+        
+        Example items:
+        - I am usually: (a) bored (b) neutral (c) excited about life
+        - My life is: (a) empty and without purpose (b) routine (c) full of good things
+        - I am: (a) undecided about my life goals (b) somewhat clear (c) very clear about my life goals
+        
+        Response format: 7-point bipolar scales
+        """,
+    },
+    "MAPS": {
+        "name": "Multidimensional Assessment of Purpose in Life (MAPS)",
+        "structure": """
+        The MAPS typically includes:
+        
+        Multiple dimensions:
+        1. PURPOSE AWARENESS
+        2. PURPOSE ENGAGEMENT
+        3. PURPOSE ALIGNMENT
+        4. PURPOSE MEANINGFULNESS
+        
+        Example items:
+        - I have a clear sense of my purpose in life
+        - I actively work toward my life purpose
+        - My daily activities align with my life purpose
+        - My purpose gives my life meaning and direction
+        
+        Response scale: 1 (Strongly disagree) to 7 (Strongly agree)
+        """
+    }
+}
+
+# Serialized once so every questionnaire prompt embeds byte-identical examples
+STANDARD_QUESTIONNAIRE_EXAMPLES_JSON = json.dumps(STANDARD_QUESTIONNAIRE_EXAMPLES, indent=2)
+
+class QuestionnaireDimension(BaseModel):
+    """A group of related questionnaire items."""
+    model_config = ConfigDict(extra="forbid")
+    
+    name: str
+    items: list[str]
+
+class Questionnaire(BaseModel):
+    """Structure the model must return a questionnaire in."""
+    model_config = ConfigDict(extra="forbid")
+    
+    title: str
+    description: str
+    instructions: str
+    response_scale: str
+    dimensions: list[QuestionnaireDimension]
+    
+    def to_text(self):
+        """Render the questionnaire in the plain-text layout used for saved questionnaires."""
+        sections = [
+            f"Title: {self.title}",
+            f"Description: {self.description}",
+            f"Instructions: {self.instructions}",
+            f"Response Scale: {self.response_scale}",
+        ]
+        number = 1
+        for index, dimension in enumerate(self.dimensions, 1):
+            lines = [f"Dimension {index}: {dimension.name}", ""]
+            for item in dimension.items:
+                lines.append(f"{number}. {item}")
+                number += 1
+            sections.append("---\n\n" + "\n".join(lines))
+        return "\n\n".join(sections)
+
+# Structured outputs guarantee the response parses as a Questionnaire
+QUESTIONNAIRE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "questionnaire",
+        "schema": Questionnaire.model_json_schema(),
+        "strict": True
     }
-    return examples
+}
+
+# Everything that does not depend on the thinker lives in the system message, so
+# all questionnaire requests share a long identical prefix that OpenAI's
+# automatic prompt caching can reuse. The thinker-specific text goes last.
+QUESTIONNAIRE_SYSTEM_PROMPT = f"""
+    You are an expert in psychological measurement and philosophy, specializing in creating valid questionnaires that capture philosophical concepts about meaning and purpose.
+    
+    Based on the thinker's ideas about meaning provided by the user, create a comprehensive questionnaire that captures their unique perspective on meaning in life.
+    
+    STANDARD QUESTIONNAIRE STRUCTURES TO USE AS TEMPLATES:
+    {STANDARD_QUESTIONNAIRE_EXAMPLES_JSON}
+    
+    TASK: Create a questionnaire that:
+    1. Reflects the thinker's specific views on meaning and purpose
+    2. Uses the structural elements from the standard questionnaires (scales, response formats, etc.)
+    3. Includes 15-20 items that capture different aspects of their philosophy
+    4. Has clear instructions and response scales
+    5. Is suitable for research purposes
+    
+    REQUIREMENTS:
+    - Use appropriate response scales (e.g., 1-7 Likert scales)
+    - Group items into logical dimensions
+    - Make items clear and accessible
+    - Ensure items directly relate to the thinker's philosophical views
+    """
+
+QUESTIONNAIRE_PROMPT = Prompt(
+    system=QUESTIONNAIRE_SYSTEM_PROMPT,
+    user_template="""
+    THINKER: {thinker_name}
+    
+    THINKER'S IDEAS ABOUT MEANING:
+    {thinker_text}
+    """,
+    # Generated questionnaires run to roughly 650 tokens of JSON
+    max_tokens=1200,
+    response_format=QUESTIONNAIRE_RESPONSE_FORMAT
+)
+
+@functools.lru_cache(maxsize=64)
+def _read_thinker(path, mtime_ns):
+    """Read a thinker text file; cached per (path, modification time)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
 
 def read_thinker_text(thinker_name):
     """
     Read the thinker's meaning text from the thinkers_texts directory.
     
+    Repeated reads of an unchanged file are served from memory; rewriting the
+    essay changes its modification time and so invalidates the cached copy.
+    If the thinker also has a record in essays.jsonl, whichever essay was
+    generated more recently is used.
+    
     Args:
         thinker_name (str): Name of the thinker
     
     Returns:
         str: Content of the thinker's text file
     """
-    thinkers_dir = Path("../thinkers_texts")
-    filename = f"{thinker_name.replace(' ', '_').lower()}_meaning.txt"
-    filepath = thinkers_dir / filename
+    filepath = essay_path(thinker_name)
+    record = read_latest_records(ESSAYS_JSONL).get(thinker_name)
     
-    if not filepath.exists():
-        raise FileNotFoundError(f"Thinker text file not found: {filepath}")
+    try:
+        mtime_ns = os.stat(filepath).st_mtime_ns
+    except FileNotFoundError:
+        if record:
+            return record["text"]
+        raise FileNotFoundError(f"Thinker text file not found: {filepath}") from None
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return f.read()
+    # generated_at has whole-second precision, so compare at that resolution
+    if record and datetime.fromisoformat(record["generated_at"]).timestamp() >= mtime_ns // 10**9:
+        return record["text"]
+    
+    return _read_thinker(str(filepath), mtime_ns)
 
-def generate_thinker_questionnaire(thinker_name, thinker_text, api_key=None, model="gpt-4"):
+def build_questionnaire_request(thinker_name, thinker_text, model=DEFAULT_MODEL):
     """
-    Generate a questionnaire based on a thinker's ideas about meaning.
+    Build the chat completion arguments for a thinker's questionnaire.
     
     Args:
         thinker_name (str): Name of the thinker
         thinker_text (str): The thinker's text about meaning
-        api_key (str): OpenAI API key (optional)
         model (str): OpenAI model to use
     
     Returns:
-        str: Generated questionnaire text
+        dict: Keyword arguments for client.chat.completions.create
     """
-    client = setup_openai_client(api_key)
-    
-    # Get standard questionnaire examples
-    examples = get_standard_questionnaire_examples()
-    
-    prompt = f"""
-    Based on the following thinker's ideas about meaning, create a comprehensive questionnaire that captures their unique perspective on meaning in life.
+    return QUESTIONNAIRE_PROMPT.request(model, thinker_name=thinker_name, thinker_text=thinker_text)
 
-    THINKER: {thinker_name}
-    
-    THINKER'S IDEAS ABOUT MEANING:
-    {thinker_text}
-    
-    STANDARD QUESTIONNAIRE STRUCTURES TO USE AS TEMPLATES:
-    {json.dumps(examples, indent=2)}
+async def generate_thinker_questionnaire(thinker_name, thinker_text, api_key=None, model=DEFAULT_MODEL, client=None):
+    """
+    Generate a questionnaire based on a thinker's ideas about meaning.
     
-    TASK: Create a questionnaire that:
-    1. Reflects {thinker_name}'s specific views on meaning and purpose
-    2. Uses the structural elements from the standard questionnaires (scales, response formats, etc.)
-    3. Includes 15-20 items that capture different aspects of their philosophy
-    4. Has clear instructions and response scales
-    5. Is suitable for research purposes
+    Args:
+        thinker_name (str): Name of the thinker
+        thinker_text (str): The thinker's text about meaning
+        api_key (str): OpenAI API key (optional)
+        model (str): OpenAI model to use
+        client (openai.AsyncOpenAI): Existing client to reuse (optional)
     
-    REQUIREMENTS:
-    - Include a title and brief description
-    - Provide clear instructions for respondents
-    - Use appropriate response scales (e.g., 1-7 Likert scales)
-    - Group items into logical dimensions if applicable
-    - Make items clear and accessible
-    - Ensure items directly relate to {thinker_name}'s philosophical views
-    
-    FORMAT: Return the questionnaire in a clear, structured format with:
-    - Title
-    - Description
-    - Instructions
-    - Items grouped by dimensions (if applicable)
-    - Response scale explanation
+    Returns:
+        Questionnaire: Generated questionnaire
     """
+    if client is None:
+        client = get_client(api_key)
     
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are an expert in psychological measurement and philosophy, specializing in creating valid questionnaires that capture philosophical concepts about meaning and purpose."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=2000,
-            temperature=0.7
-        )
+        response = await create_chat_completion(client, **build_questionnaire_request(thinker_name, thinker_text, model))
         
-        return response.choices[0].message.content.strip()
+        return Questionnaire.model_validate_json(response.choices[0].message.content)
     
     except Exception as e:
         print(f"Error generating questionnaire: {e}")
         return None
 
-def save_questionnaire(thinker_name, questionnaire_text):
+def get_questionnaire_path(thinker_name):
     """
-    Save the generated questionnaire to a file in the generated_questionnaires directory.
+    Return the path of a thinker's questionnaire, creating the generated_questionnaires directory if needed.
     
     Args:
         thinker_name (str): Name of the thinker
-        questionnaire_text (str): The generated questionnaire text
+    
+    Returns:
+        Path: Path of the questionnaire file
     """
     # Create generated_questionnaires directory if it doesn't exist
-    questionnaires_dir = Path("../generated_questionnaires")
-    questionnaires_dir.mkdir(exist_ok=True)
-    
-    # Create filename
-    filename = f"{thinker_name.replace(' ', '_').lower()}_questionnaire.txt"
-    filepath = questionnaires_dir / filename
-    
-    # Add metadata header
+    QUESTIONNAIRES_DIR.mkdir(exist_ok=True)
+    return questionnaire_path(thinker_name)
+
+def questionnaire_header(thinker_name):
+    """Return the metadata header written at the top of every questionnaire file."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    header = f"Generated on: {timestamp}\nThinker: {thinker_name}\nQuestionnaire Type: Meaning in Life\n{'='*50}\n\n"
+    return f"Generated on: {timestamp}\nThinker: {thinker_name}\nQuestionnaire Type: Meaning in Life\n{'='*50}\n\n"
+
+def save_questionnaire(thinker_name, questionnaire):
+    """
+    Save the generated questionnaire to a file in the generated_questionnaires directory.
+    
+    Args:
+        thinker_name (str): Name of the thinker
+        questionnaire (Questionnaire): The generated questionnaire
+    """
+    filepath = get_questionnaire_path(thinker_name)
     
     # Write to file
     with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(header)
-        f.write(questionnaire_text)
+        f.write(questionnaire_header(thinker_name))
+        f.write(questionnaire.to_text())
     
     print(f"Questionnaire saved to: {filepath}")
     return filepath
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate questionnaires based on thinkers\' ideas about meaning')
-    parser.add_argument('thinker_name', help='Name of the thinker/philosopher')
-    parser.add_argument('--api-key', help='OpenAI API key (optional if set as environment variable)')
-    parser.add_argument('--model', default='gpt-4', help='OpenAI model to use (default: gpt-4)')
-    
-    args = parser.parse_args()
+async def process_thinker(thinker_name, client, model, semaphore):
+    """
+    Generate and save the questionnaire for one thinker.
     
-    print(f"Generating questionnaire based on {args.thinker_name}'s ideas about meaning...")
+    Args:
+        thinker_name (str): Name of the thinker
+        client (openai.AsyncOpenAI): OpenAI client shared across thinkers
+        model (str): OpenAI model to use
+        semaphore (asyncio.Semaphore): Bounds the number of concurrent requests
+    """
+    print(f"Generating questionnaire based on {thinker_name}'s ideas about meaning...")
     
     try:
         # Read the thinker's text
-        thinker_text = read_thinker_text(args.thinker_name)
-        print(f"✅ Loaded {args.thinker_name}'s text ({len(thinker_text)} characters)")
+        thinker_text = await asyncio.to_thread(read_thinker_text, thinker_name)
+        print(f"✅ Loaded {thinker_name}'s text ({len(thinker_text)} characters)")
         
         # Generate the questionnaire
-        questionnaire = generate_thinker_questionnaire(args.thinker_name, thinker_text, args.api_key, args.model)
+        async with semaphore:
+            questionnaire = await generate_thinker_questionnaire(thinker_name, thinker_text, model=model, client=client)
         
         if questionnaire:
             # Save to file
-            filepath = save_questionnaire(args.thinker_name, questionnaire)
+            filepath = await asyncio.to_thread(save_questionnaire, thinker_name, questionnaire)
             print(f"\n✅ Questionnaire generated successfully!")
             print(f"📁 File saved: {filepath}")
         else:
-            print("❌ Failed to generate questionnaire.")
+            print(f"❌ Failed to generate questionnaire for {thinker_name}.")
             
     except FileNotFoundError as e:
         print(f"❌ Error: {e}")
@@ -236,5 +313,23 @@ def main():
     except Exception as e:
         print(f"❌ Error: {e}")
 
+def main():
+    parser = argparse.ArgumentParser(description='Generate questionnaires based on thinkers\' ideas about meaning')
+    parser.add_argument('thinker_names', nargs='+', help='Names of the thinkers/philosophers ("-" reads one name per line from stdin)')
+    parser.add_argument('--api-key', help='OpenAI API key (optional if set as environment variable)')
+    add_model_arguments(parser, structured_output=True)
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENT_REQUESTS, help=f'Maximum number of requests in flight (default: {MAX_CONCURRENT_REQUESTS})')
+    
+    args = parser.parse_args()
+    
+    try:
+        client = get_client(args.api_key)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return
+    
+    model = resolve_model(args.model, args.quality, structured_output=True)
+    asyncio.run(process_each(read_thinker_names(args.thinker_names), process_thinker, client, model, args.concurrency))
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,71 @@
+import functools
+import json
+import os
+import threading
+from datetime import datetime
+
+class JsonlSink:
+    """
+    Append-only JSONL file shared by every task in a batch.
+
+    Each generated text becomes one line of the form
+    {"thinker": ..., "generated_at": ..., **fields}, so a batch of N thinkers
+    appends to one open file instead of creating N files. Writes are
+    serialized with a lock, so the sink can be used from worker threads, and
+    each record is flushed as soon as it is written.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._file.close()
+
+    def write(self, thinker_name, fields):
+        """
+        Append one record to the sink.
+
+        Args:
+            thinker_name (str): Name of the thinker
+            fields (dict): Record content, e.g. {"text": ...}
+        """
+        record = {"thinker": thinker_name, "generated_at": datetime.now().isoformat(timespec="seconds"), **fields}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            # Flush per record so completed work survives a crash and readers see it right away
+            self._file.flush()
+
+@functools.lru_cache(maxsize=8)
+def _read_latest_records(path, mtime_ns):
+    """Parse a JSONL sink; cached per (path, modification time)."""
+    records = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                records[record["thinker"]] = record
+    return records
+
+def read_latest_records(path):
+    """
+    Return the most recent record for each thinker in a JSONL sink.
+
+    Args:
+        path (Path): Path of the JSONL file
+
+    Returns:
+        dict: Mapping of thinker name to its latest record (empty if the file does not exist)
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    return _read_latest_records(str(path), mtime_ns)
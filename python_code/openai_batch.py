@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import openai
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+
+# Batch statuses after which the job will make no further progress
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Retries for status checks and the result download. The shared client does not
+# retry, and a single transient error during a wait of up to 24h must not lose
+# a batch that has already been submitted.
+POLL_MAX_RETRIES = 5
+
+def build_batch_input(requests):
+    """
+    Serialize chat completion requests into the JSONL format expected by the Batch API.
+
+    Args:
+        requests (dict): Mapping of custom_id to chat completion arguments
+
+    Returns:
+        bytes: JSONL file content, one request per line
+    """
+    lines = [
+        json.dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}, ensure_ascii=False)
+        for custom_id, body in requests.items()
+    ]
+    return "\n".join(lines).encode("utf-8")
+
+def parse_batch_output(output_text):
+    """
+    Extract the message content of every successful request in a batch output file.
+
+    Args:
+        output_text (str): JSONL content of the batch output file
+
+    Returns:
+        dict: Mapping of custom_id to the generated text
+    """
+    results = {}
+    for line in output_text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response")
+        if not response or response.get("status_code") != 200:
+            continue
+        content = response["body"]["choices"][0]["message"]["content"]
+        if content:
+            results[record["custom_id"]] = content.strip()
+    return results
+
+async def run_batch_job(client, requests, poll_interval=30, batch_id=None):
+    """
+    Submit chat completion requests as a single OpenAI Batch API job and wait for the results.
+
+    Batch jobs are billed at roughly half the price of synchronous requests and are
+    not subject to the per-minute rate limits, at the cost of completing within a
+    24 hour window rather than immediately.
+
+    Args:
+        client (openai.AsyncOpenAI): OpenAI client
+        requests (dict): Mapping of custom_id to chat completion arguments
+        poll_interval (float): Seconds to wait between status checks
+        batch_id (str): Already submitted batch to wait for instead of submitting requests (optional)
+
+    Returns:
+        dict: Mapping of custom_id to the generated text (failed requests are omitted)
+    """
+    polling_client = client.with_options(max_retries=POLL_MAX_RETRIES)
+
+    if batch_id is None:
+        batch_input = await client.files.create(
+            file=("batch_input.jsonl", build_batch_input(requests)),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW
+        )
+        print(f"📤 Submitted batch {batch.id} with {len(requests)} requests")
+    else:
+        batch = await polling_client.batches.retrieve(batch_id)
+        print(f"📥 Resuming batch {batch.id} ({batch.status})")
+
+    output = None
+    try:
+        while batch.status not in TERMINAL_STATUSES:
+            await asyncio.sleep(poll_interval)
+            batch = await polling_client.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            if counts:
+                print(f"⏳ Batch {batch.id}: {batch.status} ({counts.completed}/{counts.total} completed)")
+
+        # Expired and cancelled batches still return the requests that finished in time
+        if batch.status != "failed" and batch.output_file_id:
+            output = await polling_client.files.content(batch.output_file_id)
+    except openai.OpenAIError:
+        print(f"❌ Lost contact with batch {batch.id}; it keeps running on OpenAI's side.")
+        print(f"   Collect its results later with: --resume-batch {batch.id}")
+        raise
+
+    if batch.status == "failed":
+        raise RuntimeError(f"Batch {batch.id} failed: {batch.errors}")
+
+    if output is None:
+        return {}
+    return parse_batch_output(output.text)
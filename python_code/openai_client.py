@@ -0,0 +1,105 @@
+import os
+
+import httpx
+import openai
+
+# Connection pool shared by all requests from one client. HTTP/2 lets concurrent
+# requests multiplex over a single TLS connection instead of opening one each.
+MAX_CONNECTIONS = 64
+
+# Models selected by the --quality option
+QUALITY_MODELS = {"fast": "gpt-4o-mini", "best": "gpt-4o"}
+DEFAULT_MODEL = QUALITY_MODELS["fast"]
+
+# Model families that accept the questionnaire request as built: a json_schema
+# response format together with max_tokens and temperature. Reasoning models
+# (o1, o3, o4, gpt-5) reject max_tokens and temperature.
+STRUCTURED_OUTPUT_PREFIXES = ("gpt-4o", "gpt-4.1")
+
+# Snapshots within those families that predate json_schema support
+NO_STRUCTURED_OUTPUT_MODELS = {"gpt-4o-2024-05-13"}
+
+# One client per API key, reused for every request made from this process
+_CLIENTS = {}
+
+def get_client(api_key=None):
+    """
+    Return the shared async OpenAI client for an API key, creating it on first use.
+
+    The client owns an HTTP connection pool bound to the event loop it is first
+    used on, so it should only be used from a single asyncio.run() call, and
+    closed with close_client() at the end of it.
+
+    Args:
+        api_key (str): OpenAI API key (optional, can use environment variable)
+
+    Returns:
+        openai.AsyncOpenAI: The shared client
+    """
+    if not api_key:
+        # Try to get from environment variable
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY environment variable or pass it as argument.")
+
+    client = _CLIENTS.get(api_key)
+    if client is None:
+        # The SDK's subclass keeps its default timeouts and redirect handling
+        http_client = openai.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+            http2=True
+        )
+        # Retries are handled by rate_limiting.create_chat_completion
+        client = openai.AsyncOpenAI(api_key=api_key, max_retries=0, http_client=http_client)
+        _CLIENTS[api_key] = client
+    return client
+
+async def close_client(client):
+    """
+    Close a client returned by get_client and its connection pool.
+
+    The client is also dropped from the cache, so a later get_client call
+    builds a fresh one.
+
+    Args:
+        client (openai.AsyncOpenAI): Client to close
+    """
+    for api_key, cached in list(_CLIENTS.items()):
+        if cached is client:
+            del _CLIENTS[api_key]
+    await client.close()
+
+def supports_structured_outputs(model):
+    """Return whether a model is known to accept the json_schema requests the questionnaire scripts send."""
+    return model.startswith(STRUCTURED_OUTPUT_PREFIXES) and model not in NO_STRUCTURED_OUTPUT_MODELS
+
+def resolve_model(model=None, quality="fast", structured_output=False):
+    """
+    Pick the model for a run: an explicit model name wins over the quality level.
+
+    Args:
+        model (str): Explicit OpenAI model name (optional)
+        quality (str): Quality level, a key of QUALITY_MODELS
+        structured_output (bool): Warn if the model may not support json_schema responses
+
+    Returns:
+        str: OpenAI model name
+    """
+    model = model or QUALITY_MODELS[quality]
+    if structured_output and not supports_structured_outputs(model):
+        print(f"⚠️  {model} is not known to support json_schema requests with max_tokens and temperature; its requests are likely to fail")
+    return model
+
+def add_model_arguments(parser, structured_output=False):
+    """
+    Add the --model and --quality options to an argument parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser to extend
+        structured_output (bool): Note in --help that the model must support json_schema responses
+    """
+    model_help = 'OpenAI model to use (overrides --quality)'
+    if structured_output:
+        model_help += '; must support json_schema structured outputs with max_tokens and temperature, e.g. gpt-4o, gpt-4o-mini or gpt-4.1'
+    parser.add_argument('--quality', choices=sorted(QUALITY_MODELS), default='fast', help='fast uses gpt-4o-mini, best uses gpt-4o (default: fast)')
+    parser.add_argument('--model', help=model_help)
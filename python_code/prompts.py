@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+
+@dataclass(frozen=True)
+class Prompt:
+    """
+    The fixed parts of a chat completion request, built once at import.
+
+    Only the user message's template slots vary per call; the system message
+    dict is shared by every request, so all requests for a prompt start with
+    a byte-identical prefix that OpenAI's prompt caching can reuse.
+    """
+    system: str
+    user_template: str
+    max_tokens: int
+    temperature: float = 0.7
+    response_format: dict = None
+    system_message: dict = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "system_message", {"role": "system", "content": self.system})
+
+    def request(self, model, **slots):
+        """
+        Build the chat completion arguments for one call.
+
+        Args:
+            model (str): OpenAI model to use
+            **slots: Values substituted into the user template
+
+        Returns:
+            dict: Keyword arguments for client.chat.completions.create
+        """
+        kwargs = {
+            "model": model,
+            "messages": [
+                self.system_message,
+                {"role": "user", "content": self.user_template.format(**slots)}
+            ],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
+        if self.response_format:
+            kwargs["response_format"] = self.response_format
+        return kwargs
@@ -0,0 +1,215 @@
+import asyncio
+import email.utils
+import random
+import re
+import time
+
+import openai
+
+# Errors worth retrying: 429s, 5xx responses and dropped connections/timeouts
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+MAX_ATTEMPTS = 6
+INITIAL_BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+def parse_reset_duration(value):
+    """
+    Parse an OpenAI rate limit reset header such as "20ms", "6s" or "1m30.5s".
+
+    Args:
+        value (str): Header value
+
+    Returns:
+        float: Duration in seconds, or None if the value could not be parsed
+    """
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+def parse_retry_after(headers):
+    """
+    Read how long the server asked us to wait from a response's retry-after-ms or retry-after header.
+
+    Args:
+        headers (Mapping): HTTP response headers
+
+    Returns:
+        float: Delay in seconds, or None if the response did not ask for one
+    """
+    try:
+        return float(headers["retry-after-ms"]) / 1000
+    except (KeyError, TypeError, ValueError):
+        pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    # retry-after may also be an HTTP date
+    retry_at = email.utils.parsedate_tz(value)
+    if retry_at is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(retry_at) - time.time())
+
+class AdaptiveRateLimiter:
+    """
+    Rate limiter driven by the x-ratelimit-* headers returned by the OpenAI API.
+
+    Every response updates the number of requests left in the current window and
+    when the request and token windows reset. While budget remains, requests go
+    out immediately; once it is exhausted (or a 429 is received) callers wait
+    until both windows have reset.
+    """
+
+    def __init__(self):
+        self._remaining = None
+        self._reset_at = 0.0
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until the current rate limit window allows another request."""
+        async with self._lock:
+            if self._remaining is not None and self._remaining <= 0:
+                delay = self._reset_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # The window has reset; the next response tells us the new budget
+                self._remaining = None
+            if self._remaining is not None:
+                self._remaining -= 1
+
+    def update(self, headers):
+        """
+        Update the limiter from the rate limit headers of a response.
+
+        Args:
+            headers (Mapping): HTTP response headers
+        """
+        now = time.monotonic()
+        # A token-limit 429 can arrive with requests to spare, so waiting for
+        # a reset means waiting for whichever window resets last
+        resets = [
+            parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            for kind in ("requests", "tokens")
+        ]
+        resets = [reset for reset in resets if reset is not None]
+        if resets:
+            self._reset_at = max(self._reset_at, now + max(resets))
+
+        try:
+            remaining = int(headers["x-ratelimit-remaining-requests"])
+        except (KeyError, ValueError):
+            return
+        # A response to a request sent before a 429 must not lift the pause
+        if self._paused_until <= now:
+            self._remaining = remaining
+
+    def pause(self, seconds):
+        """
+        Block all callers for at least the given number of seconds.
+
+        Args:
+            seconds (float): Minimum time before the next request may be sent
+        """
+        self._remaining = 0
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._reset_at = max(self._reset_at, self._paused_until)
+
+# Limiter shared by every request made from this process
+shared_limiter = AdaptiveRateLimiter()
+
+def _backoff_delay(attempt):
+    """Exponential backoff with full jitter for the given (1-based) attempt."""
+    return random.uniform(0, min(MAX_BACKOFF, INITIAL_BACKOFF * 2 ** (attempt - 1)))
+
+async def _create_with_retries(client, limiter, max_attempts, kwargs):
+    """Send a chat completion request, retrying transient errors, and return the raw response."""
+    limiter = limiter or shared_limiter
+
+    for attempt in range(1, max_attempts + 1):
+        await limiter.acquire()
+        try:
+            raw_response = await client.chat.completions.with_raw_response.create(**kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_attempts:
+                raise
+            delay = _backoff_delay(attempt)
+            response = getattr(e, "response", None)
+            if response is not None:
+                # The server's retry-after is a lower bound; jittered backoff may only lengthen it
+                delay = max(delay, parse_retry_after(response.headers) or 0.0)
+            if isinstance(e, openai.RateLimitError):
+                limiter.update(response.headers)
+                limiter.pause(delay)
+            print(f"⏳ {type(e).__name__}, retrying in {delay:.1f}s (attempt {attempt}/{max_attempts})")
+            await asyncio.sleep(delay)
+            continue
+
+        limiter.update(raw_response.headers)
+        return raw_response
+
+async def create_chat_completion(client, limiter=None, max_attempts=MAX_ATTEMPTS, **kwargs):
+    """
+    Create a chat completion, respecting the rate limiter and retrying transient errors.
+
+    Args:
+        client (openai.AsyncOpenAI): OpenAI client
+        limiter (AdaptiveRateLimiter): Limiter to use (defaults to the shared limiter)
+        max_attempts (int): Maximum number of attempts before giving up
+        **kwargs: Arguments passed to client.chat.completions.create
+
+    Returns:
+        ChatCompletion: The parsed API response
+    """
+    raw_response = await _create_with_retries(client, limiter, max_attempts, kwargs)
+    return raw_response.parse()
+
+async def stream_chat_completion(client, limiter=None, max_attempts=MAX_ATTEMPTS, **kwargs):
+    """
+    Stream a chat completion's text as it is generated.
+
+    Only opening the stream is retried; an error after the first chunk has been
+    yielded is raised to the caller. Leading and trailing whitespace of the full
+    response is dropped, matching .strip() on a non-streamed response.
+
+    Args:
+        client (openai.AsyncOpenAI): OpenAI client
+        limiter (AdaptiveRateLimiter): Limiter to use (defaults to the shared limiter)
+        max_attempts (int): Maximum number of attempts before giving up
+        **kwargs: Arguments passed to client.chat.completions.create
+
+    Yields:
+        str: Successive pieces of the generated text
+    """
+    raw_response = await _create_with_retries(client, limiter, max_attempts, {**kwargs, "stream": True})
+
+    started = False
+    pending_whitespace = ""
+    async for chunk in raw_response.parse():
+        if not chunk.choices:
+            continue
+        text = chunk.choices[0].delta.content
+        if not text:
+            continue
+        if not started:
+            text = text.lstrip()
+            if not text:
+                continue
+            started = True
+        # Hold back trailing whitespace until we know it is not the end of the response
+        content = text.rstrip()
+        if content:
+            yield pending_whitespace + content
+            pending_whitespace = ""
+        pending_whitespace += text[len(content):]
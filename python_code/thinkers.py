@@ -0,0 +1,98 @@
+import functools
+import os
+from pathlib import Path
+
+from jsonl_sink import read_latest_records
+
+# Output directories live at the project root, next to python_code/
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+THINKERS_DIR = PROJECT_ROOT / "thinkers_texts"
+QUESTIONNAIRES_DIR = PROJECT_ROOT / "generated_questionnaires"
+
+ESSAY_SUFFIX = "_meaning.txt"
+QUESTIONNAIRE_SUFFIX = "_questionnaire.txt"
+
+# Single-file sinks used by the batch scripts' --output jsonl mode
+ESSAYS_JSONL = THINKERS_DIR / "essays.jsonl"
+QUESTIONNAIRES_JSONL = QUESTIONNAIRES_DIR / "questionnaires.jsonl"
+
+# Names that str.title() does not restore correctly from a filename slug
+_SPECIAL_CASES = {
+    "Simone De Beauvoir": "Simone de Beauvoir",
+}
+
+# Cached discovery result, keyed on the modification times of the directory and essays.jsonl
+_thinkers_cache = {}
+
+@functools.lru_cache(maxsize=None)
+def thinker_slug(thinker_name):
+    """
+    Return the filename slug for a thinker, e.g. "Jean-Paul Sartre" -> "jean-paul_sartre".
+
+    Args:
+        thinker_name (str): Name of the thinker
+
+    Returns:
+        str: Lowercase slug used in file names
+    """
+    # Cached, so each thinker is slugified once per process however many paths are built
+    return thinker_name.replace(' ', '_').lower()
+
+def thinker_name_from_slug(slug):
+    """
+    Turn a filename slug back into the thinker's display name.
+
+    Args:
+        slug (str): Slug as produced by thinker_slug
+
+    Returns:
+        str: Display name of the thinker
+    """
+    thinker_name = slug.replace('_', ' ').title()
+    return _SPECIAL_CASES.get(thinker_name, thinker_name)
+
+@functools.lru_cache(maxsize=None)
+def essay_path(thinker_name):
+    """Return the path of a thinker's meaning essay."""
+    return THINKERS_DIR / f"{thinker_slug(thinker_name)}{ESSAY_SUFFIX}"
+
+@functools.lru_cache(maxsize=None)
+def questionnaire_path(thinker_name):
+    """Return the path of a thinker's generated questionnaire."""
+    return QUESTIONNAIRES_DIR / f"{thinker_slug(thinker_name)}{QUESTIONNAIRE_SUFFIX}"
+
+def _mtime_ns(path):
+    """Return a path's modification time in nanoseconds, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def get_available_thinkers():
+    """
+    Get list of available thinkers from the thinkers_texts directory.
+
+    Includes thinkers with a "_meaning.txt" file and thinkers recorded in
+    essays.jsonl. The directory is enumerated with a single os.scandir pass,
+    and the result is reused until the directory or essays.jsonl changes.
+    """
+    dir_mtime = _mtime_ns(THINKERS_DIR)
+    if dir_mtime is None:
+        return []
+    key = (dir_mtime, _mtime_ns(ESSAYS_JSONL))
+
+    cached = _thinkers_cache.get(THINKERS_DIR)
+    if cached and cached[0] == key:
+        return list(cached[1])
+
+    with os.scandir(THINKERS_DIR) as entries:
+        thinkers = {
+            thinker_name_from_slug(entry.name[:-len(ESSAY_SUFFIX)])
+            for entry in entries
+            if entry.name.endswith(ESSAY_SUFFIX) and entry.is_file(follow_symlinks=False)
+        }
+    thinkers.update(read_latest_records(ESSAYS_JSONL))
+    thinkers = sorted(thinkers)
+
+    _thinkers_cache[THINKERS_DIR] = (key, thinkers)
+    return list(thinkers)